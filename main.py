@@ -1,17 +1,68 @@
-from datetime import date, datetime
+import sys
+from datetime import date
 from enum import Enum, auto
 from io import StringIO
 from textwrap import dedent
-from typing import List, Optional, Dict
-from dataclasses import dataclass
+from typing import List, Optional, Dict, Mapping, Tuple, TypeVar
+from dataclasses import dataclass, field
+
+
+T = TypeVar("T")
+
+languages = ["en", "ru"]
+
+# Languages rolled out gradually borrow missing strings from others, see set_language_fallbacks
+fallback_chains: Dict[str, Tuple[str, ...]] = {}
+
+
+def set_language_fallbacks(fallbacks: Dict[str, List[str]]) -> None:
+    """ Resolves chains once, e.g. {"de": ["en"]} makes "de" fall back to "en" """
+
+    global fallback_chains
+    fallback_chains = {
+        lang: (lang, *chain)
+        for lang, chain in fallbacks.items()
+    }
+
+
+def fallback_chain(lang: str) -> Tuple[str, ...]:
+    return fallback_chains.get(lang, (lang,))
+
+
+def is_localized(table: Mapping[str, object], lang: str) -> bool:
+    return any(candidate in table for candidate in fallback_chain(lang))
+
+
+def localize(table: Mapping[str, T], lang: str) -> T:
+    value = table.get(lang)
+    if value is not None:
+        return value
+
+    for candidate in fallback_chain(lang):
+        value = table.get(candidate)
+        if value is not None:
+            return value
+
+    raise KeyError(lang)
 
 
 @dataclass
 class Text:
     language_to_string: Dict[str, str]
+    # Keyed on the whole chain, so changing fallbacks never serves a stale string
+    resolved: Dict[Tuple[str, ...], str] = field(init=False, repr=False, compare=False, default_factory=dict)
 
     def to_string(self, lang: str) -> str:
-        return self.language_to_string[lang]
+        string = self.language_to_string.get(lang)
+        if string is not None:
+            return string
+
+        chain = fallback_chain(lang)
+        string = self.resolved.get(chain)
+        if string is None:
+            string = self.resolved[chain] = localize(self.language_to_string, lang)
+
+        return string
 
     def __str__(self):
         raise NotImplementedError
@@ -23,8 +74,8 @@ def t(**kwargs: str) -> Text:
 
 def s(text: str) -> Text:
     return Text({
-        "en": text,
-        "ru": text,
+        lang: text
+        for lang in languages
     })
 
 
@@ -156,8 +207,8 @@ class Resume:
     applicant: Applicant
     position: Position
 
-    def to_latex(self, lang: str) -> str:
-        generator = LatexGenerator(self, lang)
+    def to_latex(self, lang: str, today: date) -> str:
+        generator = LatexGenerator(self, lang, today)
         return generator.generate()
 
 
@@ -186,6 +237,85 @@ def years_between(from_date: date, to_date: date) -> int:
     return rough_difference
 
 
+def month_index(month: Month) -> int:
+    return month.year * 12 + (month.month - 1)
+
+
+def month_range(then: MonthInterval, today: date) -> Tuple[int, int]:
+    """ Half-open range of month indexes, cut at today's month """
+
+    this_month = month_index(Month(today.year, today.month)) + 1
+
+    range_from = month_index(then.month_from)
+    range_to = this_month
+    if then.month_to is not None:
+        range_to = min(month_index(then.month_to) + 1, this_month)
+
+    # An interval that hasn't started by today is empty rather than negative
+    return range_from, max(range_from, range_to)
+
+
+def experience_ranges(experience: List[WorkingPlace], today: date) -> List[Tuple[int, int]]:
+    ranges = [
+        month_range(working_place.then, today)
+        for working_place in experience
+    ]
+
+    return sorted(
+        (range_from, range_to)
+        for range_from, range_to in ranges
+        if range_from < range_to
+    )
+
+
+def experience_months(experience: List[WorkingPlace], today: date) -> int:
+    """ Months worked in total, overlapping roles are counted once """
+
+    total = 0
+    covered_to: Optional[int] = None
+    for range_from, range_to in experience_ranges(experience, today):
+        if covered_to is not None:
+            range_from = max(range_from, covered_to)
+            range_to = max(range_to, covered_to)
+
+        total += range_to - range_from
+        covered_to = range_to
+
+    return total
+
+
+def experience_overlap_months(experience: List[WorkingPlace], today: date) -> int:
+    durations = sum(
+        range_to - range_from
+        for range_from, range_to in experience_ranges(experience, today)
+    )
+
+    return durations - experience_months(experience, today)
+
+
+def experience_gaps(experience: List[WorkingPlace], today: date) -> List[int]:
+    """ Lengths in months of breaks between consecutive roles """
+
+    gaps = []
+    covered_to: Optional[int] = None
+    for range_from, range_to in experience_ranges(experience, today):
+        if covered_to is not None and range_from > covered_to:
+            gaps.append(range_from - covered_to)
+
+        covered_to = range_to if covered_to is None else max(covered_to, range_to)
+
+    return gaps
+
+
+def ages_at_positions(applicant: Applicant) -> List[int]:
+    """ Applicant's age when each working place started, in experience order """
+
+    return [
+        applicant.age(at=date(working_place.then.month_from.year, working_place.then.month_from.month, 1))
+        for working_place in applicant.experience
+    ]
+
+
 def make_sequence(delimiters: List[str], elements: List[str]) -> str:
     [first_delimiter, *other_delimiters] = delimiters
 
@@ -285,9 +415,38 @@ class LatexGenerator():
         "ru": [", ", " и ", "."],
     }
 
-    def __init__(self, resume: Resume, lang: str) -> None:
+    language_levels = {
+        "en": {
+            LanguageLevel.Intermediate: "Intermediate",
+            LanguageLevel.Advanced: "Advanced",
+            LanguageLevel.Fluent: "Fluent",
+            LanguageLevel.Native: "Native",
+        },
+        "ru": {
+            LanguageLevel.Intermediate: "Средний",
+            LanguageLevel.Advanced: "Продвинутый",
+            LanguageLevel.Fluent: "Беглый",
+            LanguageLevel.Native: "Родной",
+        },
+    }
+
+    education_levels = {
+        "en": {
+            EducationLevel.TVET: "TVET",
+            EducationLevel.BachelorsDegree: "Bachelor's degree",
+            EducationLevel.MastersDegree: "Master's degree",
+        },
+        "ru": {
+            EducationLevel.TVET: "Среднее профессиональное",
+            EducationLevel.BachelorsDegree: "Бакалавр",
+            EducationLevel.MastersDegree: "Магистр",
+        },
+    }
+
+    def __init__(self, resume: Resume, lang: str, today: date) -> None:
         self.resume = resume
         self.lang = lang
+        self.today = today
         self.stream = StringIO()
 
     def write(self, text: str) -> None:
@@ -428,8 +587,7 @@ class LatexGenerator():
         self.write_line("")
 
     def write_age(self) -> None:
-        the_moment = datetime.now()
-        age = self.resume.applicant.age(at=the_moment)
+        age = self.resume.applicant.age(at=self.today)
 
         self.write_line(rf"{age} years old")
 
@@ -456,7 +614,7 @@ class LatexGenerator():
         self.write_line(r"\rightskip2.75cm\relax")
 
         skills = make_sequence(
-            self.separators[self.lang],
+            localize(self.separators, self.lang),
             [
                 skill.to_string(self.lang)
                 for skill in self.resume.applicant.skills
@@ -465,7 +623,7 @@ class LatexGenerator():
         self.write_line(fr"\item[] Soft: {skills}")
 
         skills = make_sequence(
-            self.separators[self.lang],
+            localize(self.separators, self.lang),
             [
                 skill.to_string(self.lang)
                 for skill in self.resume.position.skills
@@ -478,17 +636,7 @@ class LatexGenerator():
 
     def write_language(self, language: Language) -> None:
         name = language.name.to_string(self.lang)
-        level = {
-            (LanguageLevel.Intermediate, "en"): "Intermediate",
-            (LanguageLevel.Advanced, "en"): "Advanced",
-            (LanguageLevel.Fluent, "en"): "Fluent",
-            (LanguageLevel.Native, "en"): "Native",
-
-            (LanguageLevel.Intermediate, "ru"): "Средний",
-            (LanguageLevel.Advanced, "ru"): "Продвинутый",
-            (LanguageLevel.Fluent, "ru"): "Беглый",
-            (LanguageLevel.Native, "ru"): "Родной",
-        }[(language.level, self.lang)]
+        level = localize(self.language_levels, self.lang)[language.level]
 
         self.write_line(fr"\item[] {name} ({level})")
 
@@ -517,7 +665,7 @@ class LatexGenerator():
             self.write_line(self.present_caption.to_string(self.lang))
             return
 
-        month_name = self.month_names[self.lang][month.month]
+        month_name = localize(self.month_names, self.lang)[month.month]
 
         self.write_line(f"{month_name} {month.year}")
 
@@ -579,15 +727,7 @@ class LatexGenerator():
         self.write_line(r"\vspace{1.5em}")
 
     def write_education_place(self, education_place: EducationPlace, first: bool) -> None:
-        level = {
-            (EducationLevel.TVET, "en"): "TVET",
-            (EducationLevel.BachelorsDegree, "en"): "Bachelor's degree",
-            (EducationLevel.MastersDegree, "en"): "Master's degree",
-
-            (EducationLevel.TVET, "ru"): "Среднее профессиональное",
-            (EducationLevel.BachelorsDegree, "ru"): "Бакалавр",
-            (EducationLevel.MastersDegree, "ru"): "Магистр",
-        }[(education_place.level, self.lang)]
+        level = localize(self.education_levels, self.lang)[education_place.level]
 
         if not first:
             self.write_line(r"\\")
@@ -621,7 +761,7 @@ class LatexGenerator():
 
     def write_about(self) -> None:
         loves = make_sequence(
-            self.separators[self.lang],
+            localize(self.separators, self.lang),
             [
                 hobbie.to_string(self.lang)
                 for hobbie in self.resume.applicant.hobbies
@@ -665,6 +805,134 @@ class LatexGenerator():
         return self.stream.getvalue()
 
 
+def validate_text(path: str, text: Text, langs: List[str]) -> List[str]:
+    return [
+        f"{path}: missing '{lang}' translation"
+        for lang in langs
+        if not is_localized(text.language_to_string, lang)
+    ]
+
+
+def validate_texts(path: str, texts: List[Text], langs: List[str]) -> List[str]:
+    problems = []
+    for index, text in enumerate(texts):
+        problems += validate_text(f"{path}[{index}]", text, langs)
+
+    return problems
+
+
+def validate_month(path: str, month: Month) -> List[str]:
+    if 1 <= month.month <= 12:
+        return []
+
+    return [f"{path}: month {month.month} is out of range"]
+
+
+def validate_month_interval(path: str, then: MonthInterval) -> List[str]:
+    problems = validate_month(f"{path}.month_from", then.month_from)
+    if then.month_to is None:
+        return problems
+
+    problems += validate_month(f"{path}.month_to", then.month_to)
+
+    month_from = (then.month_from.year, then.month_from.month)
+    month_to = (then.month_to.year, then.month_to.month)
+    if month_to < month_from:
+        problems.append(f"{path}: ends before it starts")
+
+    return problems
+
+
+def validate_applicant(path: str, applicant: Applicant, langs: List[str]) -> List[str]:
+    problems = validate_text(f"{path}.name", applicant.name, langs)
+
+    phone = applicant.contacts.phone
+    if not (phone.isascii() and phone.isdigit() and len(phone) == 11):
+        problems.append(f"{path}.contacts.phone: expected 11 digits, got {phone!r}")
+
+    problems += validate_text(f"{path}.address.country", applicant.address.country, langs)
+    problems += validate_text(f"{path}.address.city", applicant.address.city, langs)
+
+    for index, education_place in enumerate(applicant.education):
+        place_path = f"{path}.education[{index}]"
+        problems += validate_text(f"{place_path}.place", education_place.place, langs)
+        problems += validate_text(f"{place_path}.speciality", education_place.speciality, langs)
+
+        for lang in langs:
+            if not is_localized(LatexGenerator.education_levels, lang):
+                continue
+
+            if education_place.level not in localize(LatexGenerator.education_levels, lang):
+                problems.append(f"{place_path}.level: {education_place.level.name} has no '{lang}' caption")
+
+        if education_place.then.year_to < education_place.then.year_from:
+            problems.append(f"{place_path}.then: ends before it starts")
+
+    for index, working_place in enumerate(applicant.experience):
+        place_path = f"{path}.experience[{index}]"
+        problems += validate_text(f"{place_path}.place", working_place.place, langs)
+        problems += validate_text(f"{place_path}.position", working_place.position, langs)
+        problems += validate_month_interval(f"{place_path}.then", working_place.then)
+        problems += validate_text(f"{place_path}.description", working_place.description, langs)
+        problems += validate_texts(f"{place_path}.achievements", working_place.achievements, langs)
+
+    for index, language in enumerate(applicant.languages):
+        language_path = f"{path}.languages[{index}]"
+        problems += validate_text(f"{language_path}.name", language.name, langs)
+
+        # Beginner languages are skipped by the generator
+        if language.level == LanguageLevel.Beginner:
+            continue
+
+        for lang in langs:
+            if not is_localized(LatexGenerator.language_levels, lang):
+                continue
+
+            if language.level not in localize(LatexGenerator.language_levels, lang):
+                problems.append(f"{language_path}.level: {language.level.name} has no '{lang}' caption")
+
+    problems += validate_texts(f"{path}.skills", applicant.skills, langs)
+    problems += validate_texts(f"{path}.hobbies", applicant.hobbies, langs)
+
+    return problems
+
+
+def validate_position(path: str, position: Position, langs: List[str]) -> List[str]:
+    problems = validate_text(f"{path}.name", position.name, langs)
+    problems += validate_text(f"{path}.about", position.about, langs)
+    problems += validate_texts(f"{path}.skills", position.skills, langs)
+
+    return problems
+
+
+def validate_resumes(resumes: List[Resume], langs: List[str]) -> List[str]:
+    """ Collects every problem that would break rendering of given resumes """
+
+    caption_tables: List[Mapping[str, object]] = [
+        LatexGenerator.month_names,
+        LatexGenerator.separators,
+        LatexGenerator.language_levels,
+        LatexGenerator.education_levels,
+    ]
+
+    problems = [
+        f"{lang}: generator has no captions for this language"
+        for lang in langs
+        if not all(is_localized(table, lang) for table in caption_tables)
+    ]
+
+    for name, caption in vars(LatexGenerator).items():
+        if isinstance(caption, Text):
+            problems += validate_text(f"LatexGenerator.{name}", caption, langs)
+
+    for index, resume in enumerate(resumes):
+        path = f"resumes[{index}]"
+        problems += validate_applicant(f"{path}.applicant", resume.applicant, langs)
+        problems += validate_position(f"{path}.position", resume.position, langs)
+
+    return problems
+
+
 me = Applicant(
     name=t(
         en="Denis Gruzdev",
@@ -1164,5 +1432,13 @@ python_developer = Position(
 
 
 if __name__ == "__main__":
-    latex = Resume(me, python_developer).to_latex(lang="en")
+    resume = Resume(me, python_developer)
+    lang = "en"
+    today = date.today()
+
+    problems = validate_resumes([resume], langs=[lang])
+    if problems:
+        sys.exit("\n".join(problems))
+
+    latex = resume.to_latex(lang=lang, today=today)
     print(latex)